@@ -7,8 +7,6 @@ ENLACE AL DOCUMENTO: https://drive.google.com/file/d/1PRpTfHEriegFlfSh2ikupNdjuN
 UF: Estructura de Datos y Algoritmos fundamentales.
 """
 import time
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from collections import deque
 import sys
 
@@ -66,9 +64,10 @@ class CircularLinkedList:
         return servers
 
 class LoadBalancer:
-    def __init__(self, num_servers):
+    def __init__(self, num_servers, history_limit=None):
         self.servers = CircularLinkedList()
-        self.request_history = []
+        # con history_limit solo se guardan los últimos N requests (memoria acotada)
+        self.request_history = deque(maxlen=history_limit)
         self.total_requests = 0
         
         # inicializar servidores
@@ -125,6 +124,9 @@ class LoadBalancer:
 
     def visualize_distribution_static(self):
         # gráfica de barras con la distribución final
+        # matplotlib se importa aquí para que LoadBalancer funcione sin él (p. ej. TraceReplay.py)
+        import matplotlib.pyplot as plt
+
         stats = self.get_statistics()
         
         names = [s['name'] for s in stats]
@@ -155,6 +157,8 @@ class LoadBalancer:
 
 class LoadBalancerAnimated:
     def __init__(self, num_servers, num_requests):
+        import matplotlib.pyplot as plt
+
         self.num_servers = num_servers
         self.num_requests = num_requests
         self.servers = CircularLinkedList()
@@ -193,6 +197,8 @@ class LoadBalancerAnimated:
                          fontsize=16, fontweight='bold')
 
     def animate_frame(self, frame):
+        import matplotlib.pyplot as plt
+
         # procesar varios requests a la vez para acelerar
         requests_to_process = min(self.update_every, self.num_requests - self.current_request)
         
@@ -260,6 +266,9 @@ class LoadBalancerAnimated:
         self.ax2.grid(True, alpha=0.3, linestyle='--')
 
     def start_animation(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+
         # intervalo muy corto para animación rápida
         interval = 10  # 10ms entre frames
         
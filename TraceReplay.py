@@ -0,0 +1,342 @@
+#TraceReplay.py
+"""
+Reproductor de trazas para el balanceador de carga Round Robin
+Lee trazas reales (JSON-lines o CSV) con timestamp, key y size, las envía al
+LoadBalancer de RoundRobin.py a la velocidad grabada (o acelerada) y escribe un
+reporte JSON comparable entre corridas: throughput, carga por servidor y desbalance.
+UF: Estructura de Datos y Algoritmos fundamentales.
+
+Uso:
+    python TraceReplay.py traza.jsonl --servers 4 --speed 0 --report reporte.json
+    python TraceReplay.py traza.csv --servers 4 --speed 10 --baseline reporte.json
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+
+from RoundRobin import LoadBalancer
+
+
+def parse_timestamp(value):
+    # acepta segundos (epoch o relativos) o fechas ISO 8601
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except (ValueError, OverflowError):
+        raise ValueError(f"timestamp inválido: {value!r}")
+
+
+def read_trace(path, fmt=None):
+    # generador: lee la traza línea por línea sin cargarla completa en memoria
+    if fmt is None:
+        fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+    # utf-8-sig ignora el BOM que agregan Excel y otros exportadores
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            # line_num es la línea física (cuenta líneas vacías y campos con saltos de línea)
+            reader = csv.DictReader(f)
+            try:
+                for row in reader:
+                    yield reader.line_num, row
+            except csv.Error as e:
+                # la línea que falló todavía no se cuenta en line_num
+                raise ValueError(f"línea {reader.line_num + 1}: CSV inválido ({e})")
+        elif fmt == 'jsonl':
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"línea {line_no}: JSON inválido ({e.msg})")
+                if not isinstance(row, dict):
+                    raise ValueError(f"línea {line_no}: se esperaba un objeto JSON")
+                yield line_no, row
+        else:
+            raise ValueError(f"formato de traza desconocido: {fmt}")
+
+
+def parse_requests(rows):
+    # generador: normaliza cada fila a (timestamp, key, size)
+    for line_no, row in rows:
+        if row.get('timestamp') in (None, ''):
+            raise ValueError(f"línea {line_no}: falta el campo 'timestamp'")
+        try:
+            timestamp = parse_timestamp(row['timestamp'])
+        except ValueError as e:
+            raise ValueError(f"línea {line_no}: {e}")
+        try:
+            size = int(float(row.get('size') or 0))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"línea {line_no}: size inválido: {row.get('size')!r}")
+        if not math.isfinite(timestamp):
+            raise ValueError(f"línea {line_no}: timestamp inválido: {row['timestamp']!r}")
+        if size < 0:
+            raise ValueError(f"línea {line_no}: size negativo: {size}")
+        key = row.get('key')
+        if key in (None, ''):
+            key = line_no
+        yield timestamp, key, size
+
+
+def pace_requests(requests, speed):
+    # generador: respeta los tiempos grabados divididos entre speed (speed == 0 = sin esperas)
+    # no reordena: una fila con timestamp anterior a la previa se envía sin esperar
+    if speed <= 0:
+        yield from requests
+        return
+
+    first_ts = None
+    start = time.perf_counter()
+    for request in requests:
+        timestamp = request[0]
+        if first_ts is None:
+            first_ts = timestamp
+        delay = start + (timestamp - first_ts) / speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield request
+
+
+def compute_imbalance(values):
+    # max/promedio (1.0 = perfecto) y coeficiente de variación (0.0 = perfecto)
+    # sin carga (traza vacía o todos los size en 0) cuenta como balance perfecto
+    if not values or sum(values) == 0:
+        return {'max_over_mean': 1.0, 'cv': 0.0}
+    mean = sum(values) / len(values)
+    variance = sum((v - mean) ** 2 for v in values) / len(values)
+    return {
+        'max_over_mean': max(values) / mean,
+        'cv': math.sqrt(variance) / mean
+    }
+
+
+class TraceReplayer:
+    def __init__(self, num_servers, speed=0.0, history_limit=1000):
+        # historial acotado para que trazas grandes no crezcan la memoria
+        self.balancer = LoadBalancer(num_servers, history_limit=history_limit)
+        self.speed = speed
+        self.bytes_per_server = {s.server_name: 0 for s in self.balancer.servers.get_all_servers()}
+        self.total_bytes = 0
+        self.min_ts = None
+        self.max_ts = None
+        # filas con timestamp menor al máximo visto (logs de varios hosts mezclados)
+        self.out_of_order = 0
+        self.wall_time = 0.0
+        # tiempo solo dentro de process_request (sin lectura de la traza ni esperas)
+        self.balancer_time = 0.0
+
+    def replay(self, requests):
+        # enviar cada request de la traza al balanceador
+        start = time.perf_counter()
+        for timestamp, key, size in pace_requests(requests, self.speed):
+            if self.min_ts is None:
+                self.min_ts = self.max_ts = timestamp
+            elif timestamp < self.max_ts:
+                self.out_of_order += 1
+            self.min_ts = min(self.min_ts, timestamp)
+            self.max_ts = max(self.max_ts, timestamp)
+
+            t0 = time.perf_counter()
+            server_name = self.balancer.process_request(key)
+            self.balancer_time += time.perf_counter() - t0
+            self.bytes_per_server[server_name] += size
+            self.total_bytes += size
+        self.wall_time = time.perf_counter() - start
+
+    def build_report(self, trace_path=None):
+        # reporte con llaves estables para poder comparar corridas
+        lb = self.balancer
+        total = lb.total_requests
+        trace_duration = (self.max_ts - self.min_ts) if total > 0 else 0.0
+
+        per_server = []
+        for stat in lb.get_statistics():
+            per_server.append({
+                'name': stat['name'],
+                'requests': stat['requests'],
+                'bytes': self.bytes_per_server[stat['name']],
+                'percentage': stat['percentage']
+            })
+
+        return {
+            'trace': trace_path,
+            'algorithm': 'round_robin',
+            'servers': lb.servers.size,
+            'speed': self.speed,
+            'requests': total,
+            'bytes': self.total_bytes,
+            'trace_duration_s': trace_duration,
+            'out_of_order': self.out_of_order,
+            'wall_time_s': self.wall_time,
+            'balancer_time_s': self.balancer_time,
+            'recorded_rps': total / trace_duration if trace_duration > 0 else 0.0,
+            'wall_rps': total / self.wall_time if self.wall_time > 0 else 0.0,
+            # throughput del balanceador: solo cuenta el tiempo de process_request
+            'throughput_rps': total / self.balancer_time if self.balancer_time > 0 else 0.0,
+            'throughput_bps': self.total_bytes / self.balancer_time if self.balancer_time > 0 else 0.0,
+            'per_server': per_server,
+            'imbalance': {
+                'requests': compute_imbalance([s['requests'] for s in per_server]),
+                'bytes': compute_imbalance([s['bytes'] for s in per_server])
+            }
+        }
+
+
+def print_report(report):
+    # mostrar el reporte en consola
+    print("\n" + "=" * 60)
+    print("REPORTE DE REPRODUCCIÓN DE TRAZA")
+    print("=" * 60)
+    print(f"\nTraza: {report['trace']}")
+    print(f"Servidores: {report['servers']}   Velocidad: {report['speed'] or 'máxima'}")
+    print(f"Solicitudes: {report['requests']}   Bytes: {report['bytes']}")
+    print(f"Duración grabada: {report['trace_duration_s']:.3f}s   Tiempo real: {report['wall_time_s']:.3f}s")
+    print(f"Ritmo de reproducción (lectura + esperas): {report['wall_rps']:.1f} req/s")
+    if report['out_of_order']:
+        print(f"Advertencia: {report['out_of_order']} solicitudes fuera de orden por timestamp "
+              "(se enviaron en el orden del archivo)", file=sys.stderr)
+    print(f"Throughput del balanceador: {report['throughput_rps']:.1f} req/s   "
+          f"{report['throughput_bps']:.1f} bytes/s ({report['balancer_time_s']:.3f}s en process_request)\n")
+
+    print(f"{'Servidor':<20} {'Requests':<12} {'Bytes':<15} {'Porcentaje':<12}")
+    print("-" * 60)
+    for s in report['per_server']:
+        print(f"{s['name']:<20} {s['requests']:<12} {s['bytes']:<15} {s['percentage']:.2f}%")
+
+    print("-" * 60)
+    for metric, values in report['imbalance'].items():
+        print(f"Desbalance ({metric}): max/promedio = {values['max_over_mean']:.3f}, CV = {values['cv']:.3f}")
+    print("=" * 60 + "\n")
+
+
+def load_baseline(path):
+    # cargar y validar un reporte anterior antes de correr la reproducción
+    try:
+        with open(path, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"no se pudo leer el reporte base {path}: {e}")
+
+    if not isinstance(baseline, dict):
+        raise ValueError(f"el reporte base {path} no es un objeto JSON")
+    missing = [k for k in ('servers', 'trace', 'speed', 'requests', 'bytes', 'throughput_rps', 'throughput_bps')
+               if k not in baseline]
+    for metric in ('requests', 'bytes'):
+        values = baseline.get('imbalance')
+        values = values.get(metric) if isinstance(values, dict) else None
+        for name in ('max_over_mean', 'cv'):
+            if not isinstance(values, dict) or not isinstance(values.get(name), (int, float)):
+                missing.append(f"imbalance.{metric}.{name}")
+    for k in ('throughput_rps', 'throughput_bps'):
+        if k in baseline and not isinstance(baseline[k], (int, float)):
+            missing.append(k)
+    if missing:
+        raise ValueError(f"al reporte base {path} le faltan campos: {', '.join(dict.fromkeys(missing))}")
+    return baseline
+
+
+def trace_name(report):
+    # la traza se compara por nombre de archivo: 't.jsonl' y './t.jsonl' son la misma
+    return os.path.basename(os.path.normpath(str(report['trace'])))
+
+
+def compare_reports(current, baseline):
+    # diferencias contra un reporte anterior (positivo = aumentó)
+    checks = [('trace', trace_name(baseline), trace_name(current))]
+    checks += [(key, baseline[key], current[key]) for key in ('servers', 'speed', 'requests', 'bytes')]
+    for key, before, now in checks:
+        if now != before:
+            print(f"Advertencia: '{key}' difiere del reporte base ({before!r} vs {now!r}), "
+                  "la comparación no es equivalente", file=sys.stderr)
+
+    rows = [
+        ('throughput_rps', current['throughput_rps'], baseline['throughput_rps']),
+        ('throughput_bps', current['throughput_bps'], baseline['throughput_bps'])
+    ]
+    for metric in ('requests', 'bytes'):
+        for name in ('max_over_mean', 'cv'):
+            rows.append((f"imbalance.{metric}.{name}",
+                         current['imbalance'][metric][name],
+                         baseline['imbalance'][metric][name]))
+
+    print(f"{'Métrica':<32} {'Base':>16} {'Actual':>16} {'Cambio':>10}")
+    print("-" * 78)
+    for name, now, before in rows:
+        if now == before:
+            change = "+0.00%"
+        else:
+            change = f"{(now - before) / before * 100:+.2f}%" if before else "n/a"
+        print(f"{name:<32} {before:>16.3f} {now:>16.3f} {change:>10}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce una traza de requests sobre el balanceador Round Robin")
+    parser.add_argument('trace', help="archivo de traza (.jsonl o .csv) con timestamp, key y size")
+    parser.add_argument('--servers', type=int, default=4, help="número de servidores (default: 4)")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="1 = velocidad grabada, 10 = 10x más rápido, 0 = sin esperas (default: 0)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="forzar formato (default: por extensión)")
+    parser.add_argument('--limit', type=int, help="procesar solo las primeras N solicitudes")
+    parser.add_argument('--report', help="ruta donde escribir el reporte JSON")
+    parser.add_argument('--baseline', help="reporte JSON anterior para comparar")
+    args = parser.parse_args(argv)
+
+    if args.servers <= 0:
+        parser.error("--servers debe ser mayor a 0")
+    if args.speed < 0:
+        parser.error("--speed no puede ser negativo")
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit no puede ser negativo")
+    if not os.path.isfile(args.trace):
+        parser.error(f"no existe la traza: {args.trace}")
+    if args.baseline and not os.path.isfile(args.baseline):
+        parser.error(f"no existe el reporte base: {args.baseline}")
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # pipeline de generadores: leer -> normalizar -> (limitar) -> reproducir
+    requests = parse_requests(read_trace(args.trace, args.format))
+    if args.limit is not None:
+        requests = islice(requests, args.limit)
+
+    replayer = TraceReplayer(args.servers, speed=args.speed)
+    try:
+        replayer.replay(requests)
+    except (ValueError, OSError) as e:
+        print(f"Error en la traza: {e}", file=sys.stderr)
+        return 1
+
+    report = replayer.build_report(args.trace)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Reporte guardado en {args.report}\n")
+
+    if baseline is not None:
+        compare_reports(report, baseline)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
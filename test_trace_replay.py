@@ -0,0 +1,234 @@
+#test_trace_replay.py
+"""
+Pruebas del reproductor de trazas (TraceReplay.py)
+Ejecutar con: python -m pytest -q
+"""
+import json
+
+import pytest
+
+from TraceReplay import compute_imbalance, main, pace_requests
+
+
+def write_jsonl(path, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write((row if isinstance(row, str) else json.dumps(row)) + "\n")
+    return str(path)
+
+
+def write_csv(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("timestamp,key,size\n")
+        for line in lines:
+            f.write(line + "\n")
+    return str(path)
+
+
+def run_report(tmp_path, trace, *args):
+    report_path = str(tmp_path / "reporte.json")
+    assert main([trace, '--report', report_path, *args]) == 0
+    with open(report_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_jsonl_report_numbers(tmp_path):
+    trace = write_jsonl(tmp_path / "t.jsonl", [
+        {'timestamp': 0.0, 'key': 'a', 'size': 10},
+        {'timestamp': 0.5, 'key': 'b', 'size': 30},
+        {'timestamp': 1.0, 'key': 'c', 'size': 20},
+        {'timestamp': 2.0, 'key': 'd', 'size': 40},
+    ])
+    report = run_report(tmp_path, trace, '--servers', '2')
+
+    assert report['requests'] == 4
+    assert report['bytes'] == 100
+    assert report['trace_duration_s'] == 2.0
+    assert report['recorded_rps'] == 2.0
+    assert [s['requests'] for s in report['per_server']] == [2, 2]
+    assert [s['bytes'] for s in report['per_server']] == [30, 70]
+    assert report['imbalance']['requests'] == {'max_over_mean': 1.0, 'cv': 0.0}
+    assert report['imbalance']['bytes']['max_over_mean'] == pytest.approx(1.4)
+    assert report['imbalance']['bytes']['cv'] == pytest.approx(0.4)
+    assert report['throughput_rps'] > 0
+    assert report['balancer_time_s'] <= report['wall_time_s']
+
+
+def test_csv_iso_timestamps_and_limit(tmp_path):
+    trace = write_csv(tmp_path / "t.csv", [
+        "2024-01-01T00:00:00Z,a,5",
+        "2024-01-01T00:00:01Z,b,5",
+        "2024-01-01T00:00:02Z,,5",
+        "2024-01-01T00:00:03Z,d,5",
+    ])
+    report = run_report(tmp_path, trace, '--servers', '3', '--limit', '3')
+
+    assert report['requests'] == 3
+    assert report['bytes'] == 15
+    assert report['trace_duration_s'] == 2.0
+    assert [s['requests'] for s in report['per_server']] == [1, 1, 1]
+
+
+def test_empty_trace_is_perfectly_balanced(tmp_path):
+    trace = write_jsonl(tmp_path / "t.jsonl", [])
+    report = run_report(tmp_path, trace)
+
+    assert report['requests'] == 0
+    assert report['imbalance']['requests'] == {'max_over_mean': 1.0, 'cv': 0.0}
+    assert report['imbalance']['bytes'] == {'max_over_mean': 1.0, 'cv': 0.0}
+
+
+def test_compute_imbalance():
+    assert compute_imbalance([]) == {'max_over_mean': 1.0, 'cv': 0.0}
+    assert compute_imbalance([0, 0]) == {'max_over_mean': 1.0, 'cv': 0.0}
+    assert compute_imbalance([1, 3]) == {'max_over_mean': 1.5, 'cv': 0.5}
+
+
+def test_pace_requests_follows_recorded_time(monkeypatch):
+    clock = [0.0]
+    sleeps = []
+    monkeypatch.setattr('TraceReplay.time.perf_counter', lambda: clock[0])
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+    monkeypatch.setattr('TraceReplay.time.sleep', fake_sleep)
+
+    requests = [(10.0, 'a', 0), (12.0, 'b', 0), (16.0, 'c', 0)]
+    assert list(pace_requests(requests, speed=2)) == requests
+    assert sleeps == [1.0, 2.0]
+
+    sleeps.clear()
+    assert list(pace_requests(requests, speed=0)) == requests
+    assert sleeps == []
+
+
+@pytest.mark.parametrize('rows, message', [
+    (['[1, 2]'], "línea 1: se esperaba un objeto JSON"),
+    (['{"timestamp": 1'], "línea 1: JSON inválido"),
+    ([{'key': 'a'}], "línea 1: falta el campo 'timestamp'"),
+    ([{'timestamp': 'ayer'}], "línea 1: timestamp inválido"),
+    ([{'timestamp': 1, 'size': 1}, {'timestamp': 2, 'size': [1]}], "línea 2: size inválido"),
+    ([{'timestamp': 1, 'size': {'a': 1}}], "línea 1: size inválido"),
+    ([{'timestamp': 1, 'size': -5}], "línea 1: size negativo"),
+])
+def test_malformed_jsonl_rows(tmp_path, capsys, rows, message):
+    trace = write_jsonl(tmp_path / "t.jsonl", rows)
+    assert main([trace]) == 1
+    assert message in capsys.readouterr().err
+
+
+def test_malformed_csv_size(tmp_path, capsys):
+    trace = write_csv(tmp_path / "t.csv", ["1,a,5", "2,b,inf"])
+    assert main([trace]) == 1
+    assert "línea 3: size inválido" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('args, message', [
+    (['--limit', '-1'], "--limit no puede ser negativo"),
+    (['--speed', '-3'], "--speed no puede ser negativo"),
+    (['--servers', '0'], "--servers debe ser mayor a 0"),
+    (['--baseline', 'no-existe.json'], "no existe el reporte base"),
+    (['--baseline', '.'], "no existe el reporte base"),
+])
+def test_invalid_arguments(tmp_path, capsys, args, message):
+    trace = write_jsonl(tmp_path / "t.jsonl", [{'timestamp': 0}])
+    with pytest.raises(SystemExit):
+        main([trace, *args])
+    assert message in capsys.readouterr().err
+
+
+def test_invalid_baseline_fails_before_replay(tmp_path, capsys):
+    trace = write_jsonl(tmp_path / "t.jsonl", [{'timestamp': 0}])
+    baseline = tmp_path / "base.json"
+    baseline.write_text("{}", encoding='utf-8')
+    report_path = tmp_path / "reporte.json"
+
+    with pytest.raises(SystemExit):
+        main([trace, '--baseline', str(baseline), '--report', str(report_path)])
+    assert "le faltan campos" in capsys.readouterr().err
+    assert not report_path.exists()
+
+
+def test_baseline_comparison(tmp_path, capsys):
+    trace = write_jsonl(tmp_path / "t.jsonl", [
+        {'timestamp': i, 'key': i, 'size': 10 * (i + 1)} for i in range(6)
+    ])
+    baseline = tmp_path / "base.json"
+    assert main([trace, '--servers', '3', '--report', str(baseline)]) == 0
+    capsys.readouterr()
+
+    assert main([trace, '--servers', '3', '--baseline', str(baseline)]) == 0
+    captured = capsys.readouterr()
+    assert "imbalance.bytes.max_over_mean" in captured.out
+    assert "Advertencia" not in captured.err
+
+    assert main([trace, '--servers', '2', '--baseline', str(baseline)]) == 0
+    assert "'servers' difiere del reporte base" in capsys.readouterr().err
+
+
+def test_baseline_with_limit_warns_about_workload(tmp_path, capsys):
+    trace = write_jsonl(tmp_path / "t.jsonl", [
+        {'timestamp': i, 'key': i, 'size': 10 * (i + 1)} for i in range(10)
+    ])
+    baseline = tmp_path / "base.json"
+    assert main([trace, '--servers', '3', '--report', str(baseline)]) == 0
+    capsys.readouterr()
+
+    assert main([trace, '--servers', '3', '--limit', '2', '--baseline', str(baseline)]) == 0
+    err = capsys.readouterr().err
+    assert "'requests' difiere del reporte base (10 vs 2)" in err
+    assert "'bytes' difiere del reporte base (550 vs 30)" in err
+
+
+def test_baseline_same_trace_different_path(tmp_path, capsys, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_jsonl(tmp_path / "t.jsonl", [{'timestamp': 0}, {'timestamp': 1}])
+    assert main(['t.jsonl', '--report', 'base.json']) == 0
+    capsys.readouterr()
+
+    assert main(['./t.jsonl', '--baseline', 'base.json']) == 0
+    assert "Advertencia" not in capsys.readouterr().err
+
+
+def test_csv_error_reports_physical_line(tmp_path, capsys):
+    trace = write_csv(tmp_path / "t.csv", ["1,a,5", "", "2,b,5", "", "3,c,inf"])
+    assert main([trace]) == 1
+    assert "línea 6: size inválido" in capsys.readouterr().err
+
+    trace = write_csv(tmp_path / "t2.csv", ['1,"a\nb",5', "2,c,5", "3,d,-1"])
+    assert main([trace]) == 1
+    assert "línea 5: size negativo" in capsys.readouterr().err
+
+
+def test_csv_with_utf8_bom(tmp_path):
+    trace = tmp_path / "t.csv"
+    trace.write_bytes("\ufefftimestamp,key,size\n1,a,5\n2,b,7\n".encode('utf-8'))
+    report = run_report(tmp_path, str(trace))
+
+    assert report['requests'] == 2
+    assert report['bytes'] == 12
+
+
+def test_trace_directory_is_rejected(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path)])
+    assert "no existe la traza" in capsys.readouterr().err
+
+
+def test_csv_field_too_large(tmp_path, capsys):
+    trace = write_csv(tmp_path / "t.csv", ["1,a,5", "2," + "x" * 200000 + ",5"])
+    assert main([trace]) == 1
+    assert "línea 3: CSV inválido" in capsys.readouterr().err
+
+
+def test_out_of_order_timestamps(tmp_path, capsys):
+    trace = write_jsonl(tmp_path / "t.jsonl", [
+        {'timestamp': 5}, {'timestamp': 1}, {'timestamp': 3}, {'timestamp': 9},
+    ])
+    report = run_report(tmp_path, trace)
+
+    assert report['trace_duration_s'] == 8.0
+    assert report['recorded_rps'] == 0.5
+    assert report['out_of_order'] == 2
+    assert "2 solicitudes fuera de orden" in capsys.readouterr().err